@@ -1,12 +1,54 @@
 import random
 from card import Card
 
+MASK64 = (1 << 64) - 1
+
+def mix64(value):
+    # SplitMix64 finalizer: turns any 64-bit input into a well-mixed 64-bit output
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+def hand_key(seed, hand_index):
+    # Independent stream key for one hand, derived directly from (seed, hand_index)
+    return mix64(mix64(seed & MASK64) ^ (hand_index & MASK64))
+
+def shuffle_order(seed, hand_index, size=52):
+    """
+    Returns the shuffled positions for the given hand as a list of indices into an unshuffled deck.
+
+    The random values come from a counter-based generator: draw i of hand h is mix64(key(seed, h) ^ i), so any
+    hand can be produced in constant time without replaying earlier hands, and the result does not depend on
+    how hands are split across workers.
+    """
+    key = hand_key(seed, hand_index)
+    order = list(range(size))
+    # Fisher-Yates, scaling each 64-bit draw into [0, i] with a multiply and shift
+    for i in range(size - 1, 0, -1):
+        j = (mix64(key ^ i) * (i + 1)) >> 64
+        order[i], order[j] = order[j], order[i]
+    return order
+
 class Deck:
-    def __init__(self):
-        self.cards = [Card(suit, rank) for suit in Card.SUITS for rank in Card.RANKS]
+    def __init__(self, seed=None, hand_index=0):
+        self.cards = self.unshuffled_cards()
+        # With a seed, shuffles are reproducible from (seed, hand_index) alone; without one, the global random is used
+        self.seed = seed
+        self.hand_index = hand_index
+
+    @staticmethod
+    def unshuffled_cards():
+        return [Card(suit, rank) for suit in Card.SUITS for rank in Card.RANKS]
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        if self.seed is None:
+            random.shuffle(self.cards)
+        else:
+            # Put the remaining cards back in unshuffled order first, so repeated calls give the same order
+            # and cards that were already dealt stay out of the deck
+            cards = sorted(self.cards, key=lambda card: (Card.SUITS.index(card.suit), Card.RANKS.index(card.rank)))
+            self.cards = [cards[i] for i in shuffle_order(self.seed, self.hand_index, len(cards))]
 
     def deal(self, num_hands, cards_per_hand):
         if num_hands * cards_per_hand > len(self.cards):
@@ -16,4 +58,4 @@ class Deck:
     def deal_community_cards(self, num_cards):
         if num_cards > len(self.cards):
             raise ValueError('Not enough cards in the deck to deal community cards')
-        return [self.cards.pop() for _ in range(num_cards)]
\ No newline at end of file
+        return [self.cards.pop() for _ in range(num_cards)]
@@ -1,31 +1,145 @@
+import time
 import tkinter as tk
 from poker_simulation import PokerSimulation
 
+# Number of community cards on a full board
+COMMUNITY_CARD_SLOTS = 5
+# Players are laid out in columns of at most PLAYER_ROWS hands, each with its result line beside it
+PLAYER_ROWS = 5
+PLAYER_COLUMN_WIDTH = 300
+# Largest table the layout supports; two columns keep the window within about 620x615 pixels
+MAX_PLAYERS = 10
+
 class PokerGUI:
-    def __init__(self):
+    """
+    Retained-mode poker table. Every canvas item (card slots, winner highlights, status text) is created once
+    in create_items and afterwards only changed through itemconfigure, so long-running sessions neither
+    rebuild the canvas nor leak items. Redraws are coalesced with after_idle, and auto-play mode deals hands
+    continuously while the status line reports frames and hands per second.
+    """
+
+    def __init__(self, num_players=2, auto_play_interval=1):
+        if not 2 <= num_players <= MAX_PLAYERS:
+            raise ValueError(f'The table fits between 2 and {MAX_PLAYERS} players')
         self.root = tk.Tk()
         self.root.title("Poker Simulation")
-        self.simulation = PokerSimulation(num_players=2)  # Initialize with the desired number of players
-        self.canvas = tk.Canvas(self.root, width=600, height=400)
+        self.num_players = num_players
+        self.simulation = PokerSimulation(num_players=num_players)  # Initialize with the desired number of players
+        self.card_width = 50
+        self.card_height = 70
+        self.x_offset = 20
+        self.y_offset = 20
+        self.card_spacing = 15  # Spacing between cards
+
+        # Rows from top to bottom: the player columns, the community cards, the status line
+        self.community_card_y_offset = self.card_position(min(self.num_players, PLAYER_ROWS), 0)[1] + 50
+        self.status_y_offset = self.community_card_y_offset + self.card_height + 30
+        player_columns = (self.num_players + PLAYER_ROWS - 1) // PLAYER_ROWS
+        self.canvas = tk.Canvas(self.root, width=max(600, self.x_offset + player_columns * PLAYER_COLUMN_WIDTH),
+                                height=max(400, self.status_y_offset + 20))
         self.canvas.pack()
         self.dealer_button = tk.Button(self.root, text="Next Action", command=self.next_action)
         self.test_button = tk.Button(self.root, text="Test Draw", command=self.test_draw)
+        self.auto_play_button = tk.Button(self.root, text="Auto Play", command=self.toggle_auto_play)
         self.test_button.pack()
         self.dealer_button.pack()
+        self.auto_play_button.pack()
         self.stage = "deal"
-        self.card_width = 50  # Set as class attribute
-        self.card_height = 70  # Set as class attribute
+
+        # Auto-play state; the interval is the delay in milliseconds between hands
+        self.auto_play = False
+        self.auto_play_interval = auto_play_interval
+        self.auto_play_job = None  # Id of the pending auto-play callback, so only one chain ever runs
+        self.winners = []
+
+        # Redraw coalescing and frame/hand statistics
+        self.redraw_pending = False
+        self.frames = 0
+        self.hands_played = 0
+        self.frames_per_second = 0.0
+        self.hands_per_second = 0.0
+        self.stats_started = time.perf_counter()
+        self.stats_frames = 0
+        self.stats_hands = 0
+
+        self.create_items()
+        self.request_redraw()
+        self.root.after(1000, self.stats_tick)
+
+    def card_position(self, row, column):
+        x_position = self.x_offset + column * (self.card_width + self.card_spacing)
+        y_position = self.y_offset + row * (self.card_height + self.card_spacing)
+        return x_position, y_position
+
+    def player_position(self, player_index):
+        # Top-left corner of a player's first hole card
+        x_position, y_position = self.card_position(player_index % PLAYER_ROWS, 0)
+        return x_position + (player_index // PLAYER_ROWS) * PLAYER_COLUMN_WIDTH, y_position
+
+    def create_card_slot(self, x, y):
+        # Each slot owns one rectangle and one text item; both start hidden until a card is shown
+        rect_id = self.canvas.create_rectangle(x, y, x + self.card_width, y + self.card_height,
+                                               fill="white", state="hidden")
+        text_id = self.canvas.create_text(x + self.card_width / 2, y + self.card_height / 2,
+                                          text="", width=self.card_width - 4, state="hidden")
+        return {"rect": rect_id, "text": text_id, "card": None}
+
+    def create_items(self):
+        # Player hand slots, two per player
+        self.player_slots = []
+        for i in range(self.num_players):
+            x_position, y_position = self.player_position(i)
+            self.player_slots.append([
+                self.create_card_slot(x_position + j * (self.card_width + self.card_spacing), y_position)
+                for j in range(2)
+            ])
+
+        # Community card slots sit 50 pixels below the last player row
+        self.community_slots = []
+        for i in range(COMMUNITY_CARD_SLOTS):
+            x_position = self.card_position(0, i)[0]
+            self.community_slots.append(self.create_card_slot(x_position, self.community_card_y_offset))
+
+        # Winner highlight around each player's hole cards, and a result line beside them
+        self.winner_highlights = []
+        self.winner_texts = []
+        for i in range(self.num_players):
+            x_position, y_position = self.player_position(i)
+            self.winner_highlights.append(self.canvas.create_rectangle(
+                x_position - 5, y_position - 5,
+                x_position + self.card_width * 2 + self.card_spacing + 5,
+                y_position + self.card_height + 5,
+                outline="gold", width=3, state="hidden", tags="winner"
+            ))
+            self.winner_texts.append(self.canvas.create_text(
+                x_position + (self.card_width + self.card_spacing) * 2 + 5, y_position + self.card_height / 2,
+                text="", anchor="w", font=('Helvetica', 12), fill="gold", state="hidden", tags="winner"
+            ))
+
+        # Test item toggled by the Test Draw button
+        self.test_items = [
+            self.canvas.create_rectangle(50, 50, 100, 100, outline="blue", width=3, state="hidden"),
+            self.canvas.create_text(75, 75, text="Test", font=('Helvetica', 16), fill="blue", state="hidden"),
+        ]
+        self.test_visible = False
+
+        self.status_text = self.canvas.create_text(10, self.status_y_offset, text="", anchor="w", font=('Helvetica', 10))
+        self.canvas.tag_raise("winner")
 
     def test_draw(self):
-        self.canvas.create_rectangle(50, 50, 100, 100, outline="blue", width=3)
-        self.canvas.create_text(75, 75, text="Test", font=('Helvetica', 16), fill="blue")
+        self.test_visible = not self.test_visible
+        for item in self.test_items:
+            self.canvas.itemconfigure(item, state="normal" if self.test_visible else "hidden")
         self.canvas.tag_raise("winner")
-        self.canvas.update()
 
-    def draw_card(self, card, x, y):
-        # Use self.card_width and self.card_height since they're now class attributes
-        self.canvas.create_rectangle(x, y, x + self.card_width, y + self.card_height, fill="white")
-        self.canvas.create_text(x + self.card_width / 2, y + self.card_height / 2, text=str(card))
+    def draw_card(self, slot, card):
+        # Only touch the canvas when the slot's card actually changed
+        if slot["card"] is card:
+            return
+        slot["card"] = card
+        state = "hidden" if card is None else "normal"
+        self.canvas.itemconfigure(slot["rect"], state=state)
+        self.canvas.itemconfigure(slot["text"], text="" if card is None else str(card), state=state)
 
     def next_action(self):
         if self.stage == "deal":
@@ -42,115 +156,108 @@ class PokerGUI:
             self.stage = "showdown"
         elif self.stage == "showdown":
             winners = self.simulation.evaluate_hands()
-            # Handle displaying winners here
             self.display_winners(winners)
-            self.stage = "complete"  # Or reset to "deal" for a new game
-        self.update_canvas()
+            self.hands_played += 1
+            self.stage = "complete"
+        elif self.stage == "complete":
+            # Start a new hand with a fresh deck
+            self.simulation = PokerSimulation(num_players=self.num_players)
+            self.winners = []
+            self.stage = "deal"
+        self.request_redraw()
+
+    def request_redraw(self):
+        # Coalesce any number of state changes into a single redraw once the event loop is idle
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.root.after_idle(self.update_canvas)
 
     def update_canvas(self):
-        self.canvas.delete("all")  # Clear the canvas
-        
-        # Define starting positions for the cards
-        x_offset = 20
-        y_offset = 20
-        card_spacing = 15  # Spacing between cards
-        
-        # Draw player hands
-        for i, hand in enumerate(self.simulation.hands):
-            for j, card in enumerate(hand):
-                x_position = x_offset + j * (self.card_width + card_spacing)
-                y_position = y_offset + i * (self.card_height + card_spacing)
-                self.draw_card(card, x_position, y_position)
-
-        # Draw community cards
-        community_card_x_offset = x_offset
-        community_card_y_offset = y_offset + len(self.simulation.hands) * (self.card_height + card_spacing) + 50  # Adjust 50 to whatever spacing you want below the hands
-        for i, card in enumerate(self.simulation.community_cards):
-            x_position = community_card_x_offset + i * (self.card_width + card_spacing)
-            y_position = community_card_y_offset
-            self.draw_card(card, x_position, y_position)
-
-        # Additional updates to the canvas go here
+        self.redraw_pending = False
 
-    def display_winners(self, winners):
-        print("Displaying winners...")  # Debugging statement to confirm the method is called
+        # Update player hands
+        for i, slots in enumerate(self.player_slots):
+            hand = self.simulation.hands[i] if i < len(self.simulation.hands) else []
+            for j, slot in enumerate(slots):
+                self.draw_card(slot, hand[j] if j < len(hand) else None)
 
-        # Clear any previous winner indications
-        self.canvas.delete("winner")
+        # Update community cards
+        community_cards = self.simulation.community_cards
+        for i, slot in enumerate(self.community_slots):
+            self.draw_card(slot, community_cards[i] if i < len(community_cards) else None)
 
-        if not winners:
-            print("No winners to display.")  # If there are no winners, we should not proceed
-            return
+        # Update winner highlights and result lines
+        winner_indices = self.winner_indices()
+        for i in range(self.num_players):
+            if i in winner_indices:
+                rank = self.simulation.evaluated_hands[i][0]
+                self.canvas.itemconfigure(self.winner_highlights[i], state="normal")
+                self.canvas.itemconfigure(self.winner_texts[i], text=f"Wins: {rank.name}",
+                                          state="normal")
+            else:
+                self.canvas.itemconfigure(self.winner_highlights[i], state="hidden")
+                self.canvas.itemconfigure(self.winner_texts[i], state="hidden")
 
-        for winner in winners:
-            print("Winner's hand:", winner[1])  # Debugging statement to print the winning hand
-
-            player_index = None
-            for i, hand in enumerate(self.simulation.hands):
-                full_hand = hand + self.simulation.community_cards
-                print("Full hand for player", i+1, ":", full_hand)  # Debugging statement to print the full hand
-                if all(winner_card in full_hand for winner_card in winner[1]):
-                    player_index = i
-                    break
-
-            if player_index is None:
-                print("Winner's hand not found in player hands.")  # Debugging statement
-                continue  # If the winner's hand isn't found, skip to the next winner
-
-            print("Player index:", player_index)  # Debugging statement to print player index
-
-            x_offset = 20
-            y_offset = 20 + player_index * (self.card_height + 15)  # Adjust y_offset for each player's cards
-
-            # Draw highlight for the entire hand
-            rect_id = self.canvas.create_rectangle(
-                x_offset - 5, y_offset - 5,
-                x_offset + self.card_width * 2 + 5,  # only two cards in a poker hand are unique to the player
-                y_offset + self.card_height + 5,
-                outline="gold",  # Use a more visible color
-                width=3,
-                tags="winner"
-            )
-            print(f"Created rectangle with ID {rect_id}")  # Debugging statement to confirm creation
-
-            # Bring the winner indicator to the front
-            self.canvas.tag_raise(rect_id)
-
-            # Add text indicating the winner's hand rank
-            for i, winner in enumerate(winners):
-                player_number = player_index + 1 if player_index is not None else '?'
-                text_id = self.canvas.create_text(
-                    300,  # X position for the text; you may want to adjust this
-                    350 + i * 20,  # Y position for the text; you may want to adjust this
-                    text=f"Player {player_number} wins with a {winner[0].name}",
-                    font=('Helvetica', 16),
-                    fill="gold",  # Use a more visible color
-                    tags="winner"
-                )
-                print(f"Created text with ID {text_id}")  # Debugging statement to confirm creation
-
-                # Bring the text to the front
-                self.canvas.tag_raise(text_id)
-
-        # Force redraw/update of the canvas
-        self.canvas.update_idletasks()
-        self.update_canvas()  # Call this method if it's responsible for redrawing the canvas
-
-         # Force redraw/update of the canvas
-        self.canvas.update_idletasks()
-
-        # Test with hard-coded values
-        self.canvas.create_rectangle(50, 50, 100, 100, outline="blue", width=3)
-        self.canvas.create_text(75, 75, text="Test", font=('Helvetica', 16), fill="blue")
-
-        # Bring the winner tags to the top
-        self.canvas.tag_raise("winner")
+        self.frames += 1
+
+    def stats_tick(self):
+        # Recompute the rates every second on a timer, so they drop to zero when nothing is redrawn
+        self.update_stats()
+        self.root.after(1000, self.stats_tick)
+
+    def update_stats(self):
+        now = time.perf_counter()
+        elapsed = now - self.stats_started
+        if elapsed > 0:
+            self.frames_per_second = (self.frames - self.stats_frames) / elapsed
+            self.hands_per_second = (self.hands_played - self.stats_hands) / elapsed
+        self.stats_started = now
+        self.stats_frames = self.frames
+        self.stats_hands = self.hands_played
+        self.canvas.itemconfigure(
+            self.status_text,
+            text=f"Hands: {self.hands_played}  FPS: {self.frames_per_second:.1f}  "
+                 f"Hands/s: {self.hands_per_second:.1f}"
+        )
 
-        self.update_canvas()  # Call this method if it's responsible for redrawing the canvas
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "hands_played": self.hands_played,
+            "frames_per_second": self.frames_per_second,
+            "hands_per_second": self.hands_per_second,
+        }
 
-        print("Winners displayed.")  # Debugging statement to confirm the method completed
+    def winner_indices(self):
+        # Map the winning evaluated hands back to player positions; compare_hands returns the same objects
+        return [i for i, evaluated_hand in enumerate(self.simulation.evaluated_hands)
+                if any(evaluated_hand is winner for winner in self.winners)]
 
+    def display_winners(self, winners):
+        # The highlights already exist; just record the winners and let the next redraw show them
+        self.winners = winners
+        self.request_redraw()
+
+    def toggle_auto_play(self):
+        self.auto_play = not self.auto_play
+        self.auto_play_button.configure(text="Stop Auto Play" if self.auto_play else "Auto Play")
+        if self.auto_play_job is not None:
+            # Cancel the pending step so stopping and restarting never leaves a second chain running
+            self.root.after_cancel(self.auto_play_job)
+            self.auto_play_job = None
+        if self.auto_play:
+            self.auto_play_job = self.root.after(self.auto_play_interval, self.auto_play_step)
 
+    def auto_play_step(self):
+        self.auto_play_job = None
+        if not self.auto_play:
+            return
+        # Play through to the end of the next hand; the redraws it requests collapse into one frame
+        if self.stage == "complete":
+            self.next_action()
+        while self.stage != "complete":
+            self.next_action()
+        self.auto_play_job = self.root.after(self.auto_play_interval, self.auto_play_step)
 
     def run(self):
         self.root.mainloop()
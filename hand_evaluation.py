@@ -87,17 +87,17 @@ def is_full_house(hand):
     # Count the occurrences of each rank in the sorted hand
     rank_counts = Counter(card.rank for card in sorted_hand)
     
-    # Find ranks that have three and two cards respectively
-    three_cards_rank = [rank for rank, count in rank_counts.items() if count == 3]
-    two_cards_rank = [rank for rank, count in rank_counts.items() if count == 2]
+    # Find ranks that have three cards, and ranks that can fill the pair; a second three of a kind can fill it too
+    three_cards_rank = [rank for rank, count in rank_counts.items() if count >= 3]
+    two_cards_rank = [rank for rank, count in rank_counts.items() if count >= 2 and rank not in three_cards_rank[:1]]
     
     # Check if we have both a three of a kind and a pair
     if three_cards_rank and two_cards_rank:
-        # Get the three of a kind and pair cards
-        three_of_a_kind_cards = [card for card in sorted_hand if card.rank == three_cards_rank[0]]
-        pair_cards = [card for card in sorted_hand if card.rank == two_cards_rank[0]]
+        # Get the three of a kind and pair cards, highest ranks first since the hand is sorted
+        three_of_a_kind_cards = [card for card in sorted_hand if card.rank == three_cards_rank[0]][:3]
+        pair_cards = [card for card in sorted_hand if card.rank == two_cards_rank[0]][:2]
         # The remaining cards excluding the full house
-        kickers = [card for card in sorted_hand if card.rank not in [three_cards_rank[0], two_cards_rank[0]]]
+        kickers = [card for card in sorted_hand if card not in three_of_a_kind_cards + pair_cards]
         # Return a tuple with a boolean and the sorted list including the full house first
         return (True, three_of_a_kind_cards + pair_cards + kickers)
     
@@ -129,17 +129,26 @@ def is_straight(hand):
     def rank_index_high(card):
         return Card.RANKS.index(card.rank)
 
+    # Helper function to get the rank's index with Ace low, treating it as '1'
+    def rank_index_low(card):
+        return -1 if card.rank == 'Ace' else Card.RANKS.index(card.rank)
+
     # Helper function to check for a straight
-    def check_straight(cards):
-        for i in range(len(cards) - 4):
+    def check_straight(cards, rank_index):
+        # Keep one card per rank so a paired card does not break the sequence
+        unique_cards = []
+        for card in cards:
+            if not unique_cards or unique_cards[-1].rank != card.rank:
+                unique_cards.append(card)
+        for i in range(len(unique_cards) - 4):
             # Check if the sequence is continuous
-            is_sequential = all(rank_index_high(cards[i + j]) == rank_index_high(cards[i]) - j for j in range(5))
+            is_sequential = all(rank_index(unique_cards[i + j]) == rank_index(unique_cards[i]) - j for j in range(5))
             if is_sequential:
-                return True, cards[i:i + 5]
+                return True, unique_cards[i:i + 5]
         return False, []
 
     # Check for regular straight
-    is_straight, straight_cards = check_straight(sorted_hand)
+    is_straight, straight_cards = check_straight(sorted_hand, rank_index_high)
     if is_straight:
         # Get the remaining cards excluding the straight, which are already sorted
         kickers = [card for card in sorted_hand if card not in straight_cards]
@@ -148,8 +157,8 @@ def is_straight(hand):
     # Check for Ace-low straight (A-2-3-4-5)
     if 'Ace' in [card.rank for card in hand]:
         # Ace is treated as '1' here, placed at the end
-        ace_low_hand = sorted(hand, key=lambda card: (Card.RANKS + ['Ace']).index(card.rank), reverse=True)
-        is_straight, straight_cards = check_straight(ace_low_hand)
+        ace_low_hand = sorted(hand, key=rank_index_low, reverse=True)
+        is_straight, straight_cards = check_straight(ace_low_hand, rank_index_low)
         if is_straight:
             kickers = [card for card in ace_low_hand if card not in straight_cards]
             return (True, straight_cards + kickers)
@@ -253,6 +262,54 @@ def evaluate_hand(hand):
     return HandRanking.HIGH_CARD, sorted_hand
 
 
+def hand_rank_upper_bound(hand):
+    """
+    Cheaply computes a value that is never lower than hand_rank_key(evaluate_hand(hand)).
+
+    The hand rank part is a ceiling taken from rank counts plus whether a flush and a straight are still
+    possible, and the card part is every rank in descending order, which is the largest ordering any evaluated
+    hand can produce. Only one sort and two counts are needed, so it can be used to skip full evaluations.
+    """
+    rank_indices = sorted((Card.RANKS.index(card.rank) for card in hand), reverse=True)
+    counts = sorted(Counter(rank_indices).values(), reverse=True) + [0]
+    flush_possible = max(Counter(card.suit for card in hand).values()) >= 5
+
+    # The Ace also plays low, so it is counted as -1 for the A-2-3-4-5 straight
+    distinct_ranks = set(rank_indices)
+    if Card.RANKS.index('Ace') in distinct_ranks:
+        distinct_ranks.add(-1)
+    straight_possible = any(all(low + step in distinct_ranks for step in range(5)) for low in range(-1, 9))
+
+    if flush_possible and straight_possible:
+        royal_ranks = {Card.RANKS.index(rank) for rank in ['10', 'Jack', 'Queen', 'King', 'Ace']}
+        ceiling = HandRanking.ROYAL_FLUSH if royal_ranks <= distinct_ranks else HandRanking.STRAIGHT_FLUSH
+    elif counts[0] >= 4:
+        ceiling = HandRanking.FOUR_OF_A_KIND
+    elif counts[0] >= 3 and counts[1] >= 2:
+        ceiling = HandRanking.FULL_HOUSE
+    elif flush_possible:
+        ceiling = HandRanking.FLUSH
+    elif straight_possible:
+        ceiling = HandRanking.STRAIGHT
+    elif counts[0] >= 3:
+        ceiling = HandRanking.THREE_OF_A_KIND
+    elif counts[0] >= 2 and counts[1] >= 2:
+        ceiling = HandRanking.TWO_PAIR
+    elif counts[0] >= 2:
+        ceiling = HandRanking.ONE_PAIR
+    else:
+        ceiling = HandRanking.HIGH_CARD
+    return (ceiling.value, rank_indices)
+
+
+def hand_rank_key(hand):
+    """
+    Returns a tuple representing the rank of an evaluated hand for sorting purposes.
+    It uses the hand rank value and the ranks of the individual cards.
+    """
+    return (hand[0].value, [Card.RANKS.index(card.rank) for card in hand[1]])
+
+
 def compare_hands(hands):
     """
     Compares a list of poker hands and determines the winning hand(s).
@@ -266,13 +323,6 @@ def compare_hands(hands):
     - list: A list of tuples representing the winning hand(s). In the case of a tie, all winning hands are returned.
     """
 
-    def hand_rank_key(hand):
-        """
-        Returns a tuple representing the rank of the hand for sorting purposes.
-        It uses the hand rank value and the ranks of the individual cards.
-        """
-        return (hand[0].value, [Card.RANKS.index(card.rank) for card in hand[1]])
-
     hands_sorted_by_rank = sorted(hands, key=hand_rank_key, reverse=True)
 
     # Determine the highest hand rank
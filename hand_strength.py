@@ -0,0 +1,168 @@
+# hand_strength.py
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import combinations
+from card import Card
+from hand_evaluation import evaluate_hand, hand_rank_key
+
+"""
+Hand Strength Query Documentation:
+
+A BoardStrengthIndex evaluates every two-card holding that is still possible on a given board exactly once,
+ranks it by its hand rank and the five cards that play, and keeps the resulting strengths in a sorted list.
+Holdings that play the same five ranks tie, so a board that plays ties every holding.
+Queries such as "how many holdings beat me", the percentile of a hand or the current nuts are then answered by
+binary search instead of re-evaluating all 1,081 (river) opponent combos. Holdings that contain one of the
+queried hand's own cards are removed from the counts, since an opponent cannot hold them.
+
+Indexes are cached per board through board_strength_index, so every player and every query on the same board
+shares one evaluation pass.
+"""
+
+# Maximum number of boards kept by board_strength_index before the oldest entry is dropped
+BOARD_CACHE_SIZE = 64
+
+_board_cache = {}
+
+
+def card_key(card):
+    # Card objects are not hashable, so (suit, rank) stands in for them in sets and dictionaries
+    return (card.suit, card.rank)
+
+
+def strength_key(evaluated_hand):
+    # Hand rank plus the five cards that actually play; kickers beyond those five never separate two holdings
+    rank_value, card_ranks = hand_rank_key((evaluated_hand[0], evaluated_hand[1][:5]))
+    return (rank_value, tuple(card_ranks))
+
+
+class BoardStrengthIndex:
+    def __init__(self, board):
+        if not 3 <= len(board) <= 5:
+            raise ValueError('A board must contain between 3 and 5 community cards')
+        board_keys = {card_key(card) for card in board}
+        if len(board_keys) != len(board):
+            raise ValueError('The board contains duplicate cards')
+
+        self.board = list(board)
+        self.remaining_cards = [Card(suit, rank) for suit in Card.SUITS for rank in Card.RANKS
+                                if (suit, rank) not in board_keys]
+
+        # Evaluate every possible holding once, keyed by the pair of card keys it contains
+        self.combo_strengths = {}
+        for combo in combinations(self.remaining_cards, 2):
+            combo_keys = frozenset(card_key(card) for card in combo)
+            self.combo_strengths[combo_keys] = strength_key(evaluate_hand(list(combo) + self.board))
+
+        # All strengths in ascending order, plus how many holdings make each strength for nut-rank queries
+        self.sorted_strengths = sorted(self.combo_strengths.values())
+        self.strength_counts = Counter(self.sorted_strengths)
+        self.distinct_strengths = sorted(self.strength_counts)
+
+    def _hole_keys(self, hole_cards):
+        if len(hole_cards) != 2:
+            raise ValueError('A holding must contain exactly two cards')
+        hole_keys = frozenset(card_key(card) for card in hole_cards)
+        if len(hole_keys) != 2:
+            raise ValueError('The holding contains duplicate cards')
+        if hole_keys not in self.combo_strengths:
+            raise ValueError('The holding shares a card with the board')
+        return hole_keys
+
+    def strength(self, hole_cards):
+        """
+        Returns the strength of the given hole cards on this board as (hand rank value, ranks of the five playing cards).
+        """
+        return self.combo_strengths[self._hole_keys(hole_cards)]
+
+    def _blocked_strengths(self, hole_keys):
+        # Strengths of every holding that shares at least one card with the queried hand
+        blocked = [self.combo_strengths[hole_keys]]
+        for hole_key in hole_keys:
+            for card in self.remaining_cards:
+                other_key = card_key(card)
+                if other_key not in hole_keys:
+                    blocked.append(self.combo_strengths[frozenset((hole_key, other_key))])
+        return blocked
+
+    def counts(self, hole_cards):
+        """
+        Counts the opponent holdings that beat, tie and lose to the given hole cards.
+
+        Parameters:
+        - hole_cards (list): The two Card objects held by the player being queried.
+
+        Returns:
+        - tuple: (better, ties, worse) counts over all holdings an opponent could still have.
+        """
+        hole_keys = self._hole_keys(hole_cards)
+        hero_strength = self.combo_strengths[hole_keys]
+
+        lower = bisect_left(self.sorted_strengths, hero_strength)
+        upper = bisect_right(self.sorted_strengths, hero_strength)
+        worse = lower
+        ties = upper - lower
+        better = len(self.sorted_strengths) - upper
+
+        # Remove holdings that are impossible because they use one of the player's own cards
+        for blocked_strength in self._blocked_strengths(hole_keys):
+            if blocked_strength > hero_strength:
+                better -= 1
+            elif blocked_strength < hero_strength:
+                worse -= 1
+            else:
+                ties -= 1
+        return better, ties, worse
+
+    def count_better(self, hole_cards):
+        return self.counts(hole_cards)[0]
+
+    def percentile(self, hole_cards):
+        """
+        Returns the percentage of opponent holdings the given hole cards beat, counting ties as half.
+        """
+        better, ties, worse = self.counts(hole_cards)
+        return 100.0 * (worse + ties / 2) / (better + ties + worse)
+
+    def nut_rank(self, hole_cards):
+        """
+        Returns the position of the hand among the distinct strengths on this board, 1 being the nuts.
+        Like counts, it only considers strengths an opponent can still make without the player's own cards.
+        """
+        hole_keys = self._hole_keys(hole_cards)
+        hero_strength = self.combo_strengths[hole_keys]
+        blocked_counts = Counter(self._blocked_strengths(hole_keys))
+        stronger = self.distinct_strengths[bisect_right(self.distinct_strengths, hero_strength):]
+        return 1 + sum(1 for strength in stronger if self.strength_counts[strength] > blocked_counts[strength])
+
+    def nuts(self):
+        """
+        Returns the strongest possible strength on this board and every holding that makes it.
+        """
+        nut_strength = self.sorted_strengths[-1]
+        cards_by_key = {card_key(card): card for card in self.remaining_cards}
+        holdings = [sorted((cards_by_key[key] for key in combo_keys), reverse=True)
+                    for combo_keys, combo_strength in self.combo_strengths.items()
+                    if combo_strength == nut_strength]
+        return nut_strength, holdings
+
+
+def board_strength_index(board):
+    """
+    Returns the BoardStrengthIndex for the given board, building it only the first time that board is seen.
+    The order of the board cards does not matter.
+    """
+    board_key = frozenset(card_key(card) for card in board)
+    index = _board_cache.get(board_key)
+    if index is None:
+        index = BoardStrengthIndex(board)
+        if len(_board_cache) >= BOARD_CACHE_SIZE:
+            # Drop the oldest board; dictionaries keep insertion order
+            del _board_cache[next(iter(_board_cache))]
+        _board_cache[board_key] = index
+    return index
+
+
+def clear_board_cache():
+    _board_cache.clear()
@@ -1,14 +1,35 @@
 from card import Card
 from deck import Deck
-from hand_evaluation import evaluate_hand, compare_hands
+from hand_evaluation import HandRanking, evaluate_hand, compare_hands, hand_rank_key, hand_rank_upper_bound
+
+# Straight flushes keep every suited card, so their card lists can differ in length within the same rank
+VARIABLE_LENGTH_RANKINGS = {HandRanking.STRAIGHT_FLUSH.value, HandRanking.ROYAL_FLUSH.value}
+
+def cannot_tie(bound, best_key):
+    """
+    Returns True if a hand whose hand_rank_upper_bound is `bound` can neither beat nor tie, in compare_hands,
+    a hand whose hand_rank_key is `best_key`.
+    """
+    if bound[0] != best_key[0]:
+        return bound[0] < best_key[0]
+    if bound[0] in VARIABLE_LENGTH_RANKINGS:
+        return False
+    # compare_hands breaks ties on every card except the last one
+    compared_cards = len(best_key[1]) - 1
+    return bound[1][:compared_cards] < best_key[1][:compared_cards]
 
 class PokerSimulation:
-    def __init__(self, num_players):
-        self.deck = Deck()
+    def __init__(self, num_players, seed=None, hand_index=0):
+        # A seed makes the deal reproducible from (seed, hand_index), independent of any other hand
+        self.deck = Deck(seed=seed, hand_index=hand_index)
         self.deck.shuffle()
         self.num_players = num_players
         self.hands = []
         self.community_cards = []
+        self.evaluated_hands = []
+        # Showdown counters for the early-exit mode of evaluate_hands
+        self.evaluations_performed = 0
+        self.evaluations_skipped = 0
 
     def deal_hands(self):
         # Deal two cards to each player
@@ -37,23 +58,51 @@ class PokerSimulation:
             assert isinstance(card, Card), "Dealt community card is not a Card object."
             self.community_cards.append(card)
 
-    def evaluate_hands(self):
+    def full_hand(self, hand):
+        # Ensure hand is a flat list of Card objects
+        flat_hand = [card for sublist in hand for card in sublist] if any(isinstance(el, list) for el in hand) else hand
+        full_hand = flat_hand + self.community_cards
+        
+        for card in full_hand:
+            if not isinstance(card, Card):
+                print(f"Non-card element found: {card}")
+        
+        # Ensure that full_hand is a list of Card objects
+        assert all(isinstance(card, Card) for card in full_hand), "full_hand contains non-Card elements"
+        return full_hand
+
+    def evaluate_hands(self, early_exit=False):
         # Evaluate each player's hand in combination with the community cards
-        evaluated_hands = []
-        for hand in self.hands:
-            # Ensure hand is a flat list of Card objects
-            flat_hand = [card for sublist in hand for card in sublist] if any(isinstance(el, list) for el in hand) else hand
-            full_hand = flat_hand + self.community_cards
-            
-            for card in full_hand:
-                if not isinstance(card, Card):
-                    print(f"Non-card element found: {card}")
-            
-            # Ensure that full_hand is a list of Card objects
-            assert all(isinstance(card, Card) for card in full_hand), "full_hand contains non-Card elements"
-            evaluated_hand = evaluate_hand(full_hand)
-            evaluated_hands.append(evaluated_hand)
+        full_hands = [self.full_hand(hand) for hand in self.hands]
+        if early_exit:
+            evaluated_hands = self.evaluate_candidates(full_hands)
+        else:
+            evaluated_hands = [evaluate_hand(full_hand) for full_hand in full_hands]
+            self.evaluations_performed += len(evaluated_hands)
+
+        # Keep the evaluated hands so callers can map winners back to players; skipped players are None
+        self.evaluated_hands = evaluated_hands
 
         # Determine the winner(s) among the evaluated hands
-        winners = compare_hands(evaluated_hands)
-        return winners
\ No newline at end of file
+        winners = compare_hands([hand for hand in evaluated_hands if hand is not None])
+        return winners
+
+    def evaluate_candidates(self, full_hands):
+        """
+        Fully evaluates players in order of their upper bound and stops once no remaining player can beat or tie
+        the best hand found so far. Returns the evaluated hands in player order, with None for skipped players.
+        """
+        evaluated_hands = [None] * len(full_hands)
+        bounds = [hand_rank_upper_bound(full_hand) for full_hand in full_hands]
+        best_key = None
+        for player in sorted(range(len(full_hands)), key=lambda i: bounds[i], reverse=True):
+            if best_key is not None and cannot_tie(bounds[player], best_key):
+                # Bounds are visited in descending order, so every remaining player is beaten as well
+                self.evaluations_skipped += sum(hand is None for hand in evaluated_hands)
+                break
+            evaluated_hands[player] = evaluate_hand(full_hands[player])
+            self.evaluations_performed += 1
+            key = hand_rank_key(evaluated_hands[player])
+            if best_key is None or key > best_key:
+                best_key = key
+        return evaluated_hands
@@ -3,6 +3,8 @@ import json
 from deck import Deck
 from card import Card
 from hand_evaluation import evaluate_hand, compare_hands
+from hand_strength import BoardStrengthIndex
+from poker_simulation import PokerSimulation
 
 def create_hand(cards):
     """ Helper function to create a hand from string representations of cards. """
@@ -46,15 +48,110 @@ def run_test_case(test_case):
 
 
 
+def run_board_strength_case(test_case):
+    # Checks the blocker-corrected (better, ties, worse) counts and nut rank of one holding on a board
+    index = BoardStrengthIndex(create_hand(test_case['board']))
+    hole_cards = create_hand(test_case['hole_cards'])
+    result = [list(index.counts(hole_cards)), index.nut_rank(hole_cards)]
+    expected = [test_case['expected_counts'], test_case['expected_nut_rank']]
+    return result == expected, result, expected
+
+def run_nuts_case(test_case):
+    # Checks how many holdings make the nuts and which ranks each of them holds
+    index = BoardStrengthIndex(create_hand(test_case['board']))
+    nut_strength, holdings = index.nuts()
+    expected_ranks = sorted(create_hand(test_case['expected_nut_ranks']), reverse=True)
+    all_match = all([card.rank for card in holding] == [card.rank for card in expected_ranks] for holding in holdings)
+    result = [len(holdings), all_match]
+    expected = [test_case['expected_nut_count'], True]
+    return result == expected, result, expected
+
+def showdown_winners(simulation, early_exit):
+    # Player numbers (starting at 1) of the winners of the simulation's current showdown
+    winners = simulation.evaluate_hands(early_exit=early_exit)
+    return [i + 1 for i, hand in enumerate(simulation.evaluated_hands) if any(hand is winner for winner in winners)]
+
+def run_early_exit_case(test_case):
+    # Checks that the early-exit showdown picks the same winning players as full evaluation
+    if 'seed' in test_case:
+        # Seeded deals: count the hands where the two showdown modes disagree
+        mismatches = 0
+        for num_players in test_case['num_players']:
+            for hand_index in range(test_case['num_hands']):
+                results = []
+                for early_exit in (False, True):
+                    simulation = PokerSimulation(num_players, seed=test_case['seed'], hand_index=hand_index)
+                    simulation.deal_hands()
+                    simulation.deal_flop()
+                    simulation.deal_turn()
+                    simulation.deal_river()
+                    results.append(showdown_winners(simulation, early_exit))
+                mismatches += results[0] != results[1]
+        return mismatches == 0, mismatches, 0
+
+    # Fixed hole cards and board
+    results = []
+    for early_exit in (False, True):
+        simulation = PokerSimulation(len(test_case['hands']))
+        simulation.hands = [create_hand(hand_str) for hand_str in test_case['hands']]
+        simulation.community_cards = create_hand(test_case['board'])
+        results.append(showdown_winners(simulation, early_exit))
+    expected = [test_case['expected_winners'], test_case['expected_winners']]
+    return results == expected, results, expected
+
+def seeded_deal(seed, hand_index, num_players):
+    # Deals a full hand from (seed, hand_index) and returns the hole cards followed by the board
+    simulation = PokerSimulation(num_players, seed=seed, hand_index=hand_index)
+    simulation.deal_hands()
+    simulation.deal_flop()
+    simulation.deal_turn()
+    simulation.deal_river()
+    return [repr(hand) for hand in simulation.hands] + [repr(simulation.community_cards)]
+
+def run_seeded_deal_case(test_case):
+    # Checks that a seeded deal depends only on (seed, hand_index): repeated, out of order or split across workers
+    seed, num_players = test_case['seed'], test_case['num_players']
+    hand_indices = list(range(test_case['num_hands']))
+    reference = {i: seeded_deal(seed, i, num_players) for i in hand_indices}
+
+    result = [
+        {i: seeded_deal(seed, i, num_players) for i in hand_indices} == reference,
+        {i: seeded_deal(seed, i, num_players) for i in reversed(hand_indices)} == reference,
+    ]
+    for num_workers in test_case['worker_counts']:
+        # Give each worker every num_workers-th hand and interleave their batches one hand at a time
+        batches = [hand_indices[worker::num_workers] for worker in range(num_workers)]
+        deals = {}
+        for position in range(max(len(batch) for batch in batches)):
+            for batch in batches:
+                if position < len(batch):
+                    deals[batch[position]] = seeded_deal(seed, batch[position], num_players)
+        result.append(deals == reference)
+
+    # The algorithm itself must not drift, or recorded (seed, hand_index) pairs stop reproducing
+    pinned = test_case['pinned_deal']
+    expected_deal = [repr(create_hand(hand_str)) for hand_str in pinned['hands']] + [repr(create_hand(pinned['board']))]
+    result.append(seeded_deal(seed, pinned['hand_index'], num_players) == expected_deal)
+    return all(result), result, [True] * len(result)
+
+# Runner for each test case type; cases without a type compare showdown winners
+CASE_RUNNERS = {
+    'showdown': run_test_case,
+    'board_strength': run_board_strength_case,
+    'nuts': run_nuts_case,
+    'early_exit': run_early_exit_case,
+    'seeded_deal': run_seeded_deal_case,
+}
+
 def main():
     test_cases = read_test_cases('test_cases.json')  # Or whatever your test file is called
     passed, failed = 0, 0
 
     for i, test_case in enumerate(test_cases, 1):
-        is_correct, winner, expected_winner = run_test_case(test_case)
+        is_correct, winner, expected_winner = CASE_RUNNERS[test_case.get('type', 'showdown')](test_case)
         print(f"Test Case {i}:")
-        print(f"Winner: {winner}")
-        print(f"Expected Winner: {expected_winner}")
+        print(f"Result: {winner}")
+        print(f"Expected: {expected_winner}")
         print(f"Test {'PASSED' if is_correct else 'FAILED'}")
         print()  # Empty line for readability between test cases
         